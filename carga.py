@@ -0,0 +1,253 @@
+"""
+Gravação e reprodução de operações do SistemaBiblioteca para testes de carga.
+
+Formato do trace (JSON Lines, uma operação por linha):
+    [segundos_desde_o_inicio, "metodo", [args], {kwargs}]
+
+O estado inicial da gravação é guardado ao lado do trace, em
+<trace>.livros.csv e <trace>.usuarios.csv, e é dele que a reprodução parte.
+
+Uso:
+    python main.py --gravar trace.jsonl           # grava uma sessão
+    python carga.py trace.jsonl                   # reproduz na velocidade máxima
+    python carga.py trace.jsonl --velocidade 2    # reproduz a 2x a velocidade gravada
+    python carga.py trace.jsonl --threads 4       # reparte as operações entre 4 threads
+"""
+
+import argparse
+import json
+import math
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from services import SistemaBiblioteca, SnapshotBiblioteca
+from models import (
+    LivroIndisponivelError,
+    LivroNaoEncontradoError,
+    UsuarioNaoEncontradoError,
+)
+
+
+METODOS_GRAVADOS = (
+    "cadastrar_livro",
+    "cadastrar_usuario",
+    "emprestar_livro",
+    "devolver_livro",
+    "buscar_livros",
+    "relatorio_livros_disponiveis",
+    "relatorio_livros_emprestados",
+    "relatorio_usuarios",
+    "painel_livros",
+    "painel_usuarios",
+)
+
+ERROS_ESPERADOS = (
+    ValueError,
+    LivroIndisponivelError,
+    LivroNaoEncontradoError,
+    UsuarioNaoEncontradoError,
+)
+
+
+# ================== GRAVAÇÃO ==================
+
+
+class GravadorOperacoes:
+    """
+    Envolve um SistemaBiblioteca e grava cada chamada aos métodos públicos
+    em METODOS_GRAVADOS. Os demais atributos (livros, usuarios, ...) são
+    repassados diretamente ao sistema original.
+
+    Os CSVs são copiados ao lado do trace na criação, pois a sessão gravada
+    continua alterando os originais.
+    """
+
+    def __init__(self, sistema: SistemaBiblioteca, caminho_trace: str):
+        self._sistema = sistema
+        origens = (sistema.caminho_csv_livros, sistema.caminho_csv_usuarios)
+        for origem, destino in zip(origens, caminhos_estado_inicial(caminho_trace)):
+            if os.path.exists(origem):
+                shutil.copy(origem, destino)
+            elif os.path.exists(destino):
+                # Sem CSV de origem o estado inicial é vazio; descarta cópia antiga
+                os.remove(destino)
+        self._arquivo = open(caminho_trace, mode="w", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._inicio = time.perf_counter()
+
+    def __getattr__(self, nome):
+        atributo = getattr(self._sistema, nome)
+        if nome not in METODOS_GRAVADOS:
+            return atributo
+
+        def gravado(*args, **kwargs):
+            instante = time.perf_counter() - self._inicio
+            # O snapshot recebido não é gravado: na reprodução, relatórios e
+            # painéis leem de um snapshot do próprio sistema reproduzido
+            argumentos = [a for a in args if not isinstance(a, SnapshotBiblioteca)]
+            kwargs_gravados = {k: v for k, v in kwargs.items() if k != "snapshot"}
+            registro = json.dumps(
+                [round(instante, 6), nome, argumentos, kwargs_gravados],
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+            with self._lock:
+                self._arquivo.write(registro + "\n")
+            return atributo(*args, **kwargs)
+
+        return gravado
+
+    def fechar(self):
+        with self._lock:
+            self._arquivo.close()
+
+
+def caminhos_estado_inicial(caminho_trace: str) -> Tuple[str, str]:
+    """
+    Caminhos das cópias dos CSVs de livros e usuários associadas ao trace.
+    """
+    return (f"{caminho_trace}.livros.csv", f"{caminho_trace}.usuarios.csv")
+
+
+# ================== REPRODUÇÃO ==================
+
+
+def carregar_trace(caminho_trace: str) -> List[list]:
+    with open(caminho_trace, mode="r", encoding="utf-8") as f:
+        return [json.loads(linha) for linha in f if linha.strip()]
+
+
+def percentil(valores_ordenados: List[float], p: float) -> float:
+    """
+    Percentil pelo método do posto mais próximo (valores já ordenados).
+    """
+    if not valores_ordenados:
+        return 0.0
+    indice = max(0, math.ceil(p / 100 * len(valores_ordenados)) - 1)
+    return valores_ordenados[min(indice, len(valores_ordenados) - 1)]
+
+
+def reproduzir_trace(
+    sistema: SistemaBiblioteca,
+    operacoes: List[list],
+    velocidade: Optional[float] = None,
+    threads: int = 1,
+) -> Dict[str, float]:
+    """
+    Reexecuta as operações do trace contra o sistema.
+
+    velocidade=None reproduz o mais rápido possível; caso contrário, cada
+    operação é disparada em instante_gravado / velocidade. Com várias
+    threads, as operações são distribuídas em rodízio entre elas.
+
+    "erros" conta as exceções de regra de negócio (ERROS_ESPERADOS);
+    "falhas" conta qualquer outra exceção, que indica defeito no sistema.
+    """
+    latencias: List[float] = []
+    erros = 0
+    falhas = 0
+    lock = threading.Lock()
+
+    def trabalhador(fatia: List[list], inicio: float):
+        nonlocal erros, falhas
+        lat_local = []
+        erros_local = 0
+        falhas_local = 0
+        try:
+            for instante, nome, args, kwargs in fatia:
+                if velocidade:
+                    espera = inicio + instante / velocidade - time.perf_counter()
+                    if espera > 0:
+                        time.sleep(espera)
+                t0 = time.perf_counter()
+                try:
+                    getattr(sistema, nome)(*args, **kwargs)
+                except ERROS_ESPERADOS:
+                    erros_local += 1
+                except Exception:
+                    falhas_local += 1
+                lat_local.append(time.perf_counter() - t0)
+        finally:
+            # Mesmo que a thread seja interrompida, o que foi medido entra no relatório
+            with lock:
+                latencias.extend(lat_local)
+                erros += erros_local
+                falhas += falhas_local
+
+    fatias = [operacoes[i::threads] for i in range(threads)]
+    inicio = time.perf_counter()
+    workers = [
+        threading.Thread(target=trabalhador, args=(fatia, inicio)) for fatia in fatias
+    ]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    duracao = time.perf_counter() - inicio
+
+    latencias.sort()
+    return {
+        "operacoes": len(latencias),
+        "erros": erros,
+        "falhas": falhas,
+        "duracao_s": duracao,
+        "vazao_ops_s": len(latencias) / duracao if duracao > 0 else 0.0,
+        "p50_ms": percentil(latencias, 50) * 1000,
+        "p90_ms": percentil(latencias, 90) * 1000,
+        "p99_ms": percentil(latencias, 99) * 1000,
+        "max_ms": (latencias[-1] if latencias else 0.0) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reprodução de traces do SistemaBiblioteca")
+    parser.add_argument("trace", help="arquivo de trace gravado com 'main.py --gravar'")
+    parser.add_argument(
+        "--velocidade",
+        type=float,
+        default=None,
+        help="multiplicador da velocidade gravada (padrão: velocidade máxima)",
+    )
+    parser.add_argument("--threads", type=int, default=1, help="número de threads (padrão: 1)")
+    args = parser.parse_args()
+
+    operacoes = carregar_trace(args.trace)
+
+    livros_iniciais, usuarios_iniciais = caminhos_estado_inicial(args.trace)
+
+    # Parte do estado gravado junto com o trace, em uma pasta temporária
+    # para que a reprodução não altere essas cópias
+    with tempfile.TemporaryDirectory() as pasta:
+        sistema = SistemaBiblioteca(
+            caminho_csv_livros=os.path.join(pasta, "livros.csv"),
+            caminho_csv_usuarios=os.path.join(pasta, "usuarios.csv"),
+        )
+        if os.path.exists(livros_iniciais):
+            shutil.copy(livros_iniciais, sistema.caminho_csv_livros)
+            sistema.carregar_livros_de_csv()
+        if os.path.exists(usuarios_iniciais):
+            shutil.copy(usuarios_iniciais, sistema.caminho_csv_usuarios)
+            sistema.carregar_usuarios_de_csv()
+
+        resultado = reproduzir_trace(sistema, operacoes, args.velocidade, max(1, args.threads))
+
+    print(
+        f"Operações: {resultado['operacoes']} de {len(operacoes)} "
+        f"({resultado['erros']} com erro, {resultado['falhas']} com falha inesperada)"
+    )
+    print(f"Duração: {resultado['duracao_s']:.3f}s")
+    print(f"Vazão: {resultado['vazao_ops_s']:.1f} ops/s")
+    print(
+        f"Latência (ms): p50={resultado['p50_ms']:.3f} | "
+        f"p90={resultado['p90_ms']:.3f} | "
+        f"p99={resultado['p99_ms']:.3f} | "
+        f"max={resultado['max_ms']:.3f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,148 @@
+import argparse
+import shlex
+import sys
+import time
+from typing import Iterable, List
+
 from services import SistemaBiblioteca
 from ui import executar_interface
+from carga import GravadorOperacoes
+from models import (
+    LivroIndisponivelError,
+    LivroNaoEncontradoError,
+    UsuarioNaoEncontradoError,
+)
+
+
+# ================== MODO LOTE (NÃO INTERATIVO) ==================
+
+# Formato: um comando por linha, argumentos separados por espaço
+# (use aspas para textos com espaços). Linhas vazias ou iniciadas
+# com '#' são ignoradas.
+#
+#   cadastrar_livro "Título" "Autor" "Categoria" <ano> <copias>
+#   cadastrar_usuario "Nome" "Contato"
+#   emprestar <id_usuario> <id_livro>
+#   devolver <id_emprestimo>
+#   buscar [titulo=...] [autor=...] [ano=...] [categoria=...]
+
+
+def _cmd_cadastrar_livro(sistema: SistemaBiblioteca, args: List[str]) -> str:
+    titulo, autor, categoria, ano, total_copias = args
+    livro = sistema.cadastrar_livro(
+        titulo, autor, int(ano), int(total_copias), categoria, salvar=False
+    )
+    return f"Livro cadastrado. ID: {livro.id_livro}"
+
+
+def _cmd_cadastrar_usuario(sistema: SistemaBiblioteca, args: List[str]) -> str:
+    nome, contato = args
+    usuario = sistema.cadastrar_usuario(nome, contato, salvar=False)
+    return f"Usuário cadastrado. ID: {usuario.id_usuario}"
+
+
+def _cmd_emprestar(sistema: SistemaBiblioteca, args: List[str]) -> str:
+    id_usuario, id_livro = args
+    emprestimo = sistema.emprestar_livro(int(id_usuario), int(id_livro), salvar=False)
+    return f"Empréstimo realizado. ID do empréstimo: {emprestimo.id_emprestimo}"
+
+
+def _cmd_devolver(sistema: SistemaBiblioteca, args: List[str]) -> str:
+    (id_emprestimo,) = args
+    sistema.devolver_livro(int(id_emprestimo), salvar=False)
+    return f"Devolução registrada. ID do empréstimo: {id_emprestimo}"
+
+
+def _cmd_buscar(sistema: SistemaBiblioteca, args: List[str]) -> str:
+    filtros = {}
+    for arg in args:
+        chave, _, valor = arg.partition("=")
+        if chave not in ("titulo", "autor", "ano", "categoria") or not valor:
+            raise ValueError(f"Filtro inválido: '{arg}'")
+        filtros[chave] = int(valor) if chave == "ano" else valor
+
+    livros = sistema.buscar_livros(**filtros)
+    ids = ", ".join(str(livro.id_livro) for livro in livros)
+    return f"{len(livros)} livro(s) encontrado(s): {ids or 'nenhum'}"
+
+
+# nome do comando -> (função, quantidade de argumentos; None = variável)
+COMANDOS_LOTE = {
+    "cadastrar_livro": (_cmd_cadastrar_livro, 5),
+    "cadastrar_usuario": (_cmd_cadastrar_usuario, 2),
+    "emprestar": (_cmd_emprestar, 2),
+    "devolver": (_cmd_devolver, 1),
+    "buscar": (_cmd_buscar, None),
+}
+
+
+def executar_lote(sistema: SistemaBiblioteca, linhas: Iterable[str]) -> int:
+    """
+    Executa comandos estruturados (um por linha) contra o sistema,
+    reportando o resultado de cada comando. Os CSVs são gravados uma
+    única vez ao final. Retorna a quantidade de comandos com erro.
+    """
+    total = 0
+    erros = 0
+    inicio = time.perf_counter()
+
+    for numero, linha in enumerate(linhas, start=1):
+        linha = linha.strip()
+        if not linha or linha.startswith("#"):
+            continue
+
+        total += 1
+        try:
+            nome, *argumentos = shlex.split(linha)
+            if nome not in COMANDOS_LOTE:
+                raise ValueError(f"Comando desconhecido: '{nome}'")
+            comando, qtd_args = COMANDOS_LOTE[nome]
+            if qtd_args is not None and len(argumentos) != qtd_args:
+                raise ValueError(
+                    f"'{nome}' espera {qtd_args} argumento(s), recebeu {len(argumentos)}."
+                )
+            mensagem = comando(sistema, argumentos)
+            print(f"[linha {numero}] OK: {mensagem}")
+        except (
+            ValueError,
+            UsuarioNaoEncontradoError,
+            LivroNaoEncontradoError,
+            LivroIndisponivelError,
+        ) as e:
+            erros += 1
+            print(f"[linha {numero}] ERRO: {e}")
+
+    duracao = time.perf_counter() - inicio
+
+    # Persiste uma única vez ao final do lote
+    sistema.salvar_livros_csv()
+    sistema.salvar_usuarios_csv()
+
+    vazao = total / duracao if duracao > 0 else 0.0
+    print(
+        f"\nLote concluído: {total} comando(s), {total - erros} com sucesso, "
+        f"{erros} com erro, em {duracao:.3f}s ({vazao:.1f} comandos/s)."
+    )
+    return erros
+
+
+# ================== PONTO DE ENTRADA ==================
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Sistema de Gerenciamento de Biblioteca")
+    parser.add_argument(
+        "--lote",
+        metavar="ARQUIVO",
+        help="executa comandos em lote a partir de ARQUIVO ('-' para stdin)",
+    )
+    parser.add_argument(
+        "--gravar",
+        metavar="TRACE",
+        help="grava as operações da sessão em TRACE (ver carga.py)",
+    )
+    args = parser.parse_args()
+
     sistema = SistemaBiblioteca()
 
     # Carrega livros do CSV
@@ -19,7 +159,25 @@ def main():
     except FileNotFoundError:
         print("Arquivo 'usuarios.csv' não encontrado. O sistema iniciará sem usuários pré-cadastrados.")
 
-    executar_interface(sistema)
+    # A gravação começa após a carga dos CSVs: o trace parte desse estado
+    if args.gravar:
+        sistema = GravadorOperacoes(sistema, args.gravar)
+
+    erros = 0
+    try:
+        if args.lote is None:
+            executar_interface(sistema)
+        elif args.lote == "-":
+            erros = executar_lote(sistema, sys.stdin)
+        else:
+            with open(args.lote, mode="r", encoding="utf-8") as f:
+                erros = executar_lote(sistema, f)
+    finally:
+        if args.gravar:
+            sistema.fechar()
+
+    if erros:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,11 @@
-from typing import Dict, List, Optional
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Mapping, Optional, Set, Tuple
+import copy
 import itertools
 import csv
+import os
+import shutil
+import threading
 
 from models import (
     Livro,
@@ -12,6 +17,94 @@ from models import (
 )
 
 
+# Colunas sem as quais uma recarga do CSV de livros é abortada: sem elas
+# (ex.: arquivo salvo com ';' como separador) toda linha pareceria inválida
+COLUNAS_RECARGA_LIVROS = ("id_livro", "titulo", "autor", "ano", "total_copias")
+
+# Coleções versionadas pelos snapshots e tamanho das páginas em que são divididas
+COLECOES = ("livros", "usuarios", "emprestimos")
+TAMANHO_PAGINA = 256
+
+
+class _VisaoPaginada(Mapping):
+    """
+    Mapping somente leitura sobre páginas congeladas (id // TAMANHO_PAGINA).
+
+    Snapshots consecutivos compartilham as páginas que não mudaram; só as
+    páginas alteradas desde o snapshot anterior são copiadas.
+    """
+
+    def __init__(self, paginas: Dict[int, dict], tamanho: int):
+        self._paginas = paginas
+        self._tamanho = tamanho
+
+    def __getitem__(self, chave):
+        return self._paginas.get(chave // TAMANHO_PAGINA, {})[chave]
+
+    def __iter__(self) -> Iterator[int]:
+        for numero in sorted(self._paginas):
+            yield from self._paginas[numero]
+
+    def __len__(self) -> int:
+        return self._tamanho
+
+
+@dataclass(frozen=True)
+class SnapshotBiblioteca:
+    """
+    Visão somente leitura e consistente do sistema em um instante (versão).
+
+    Alterações posteriores no sistema não aparecem no snapshot, então
+    relatórios e painéis longos podem percorrê-lo sem travar empréstimos
+    e devoluções. Os objetos expostos não devem ser alterados.
+    """
+    versao: int
+    livros: Mapping[int, Livro]
+    usuarios: Mapping[int, Usuario]
+    emprestimos: Mapping[int, Emprestimo]
+
+    def relatorio_livros_disponiveis(self) -> List[Livro]:
+        return [livro for livro in self.livros.values() if livro.copias_disponiveis > 0]
+
+    def relatorio_livros_emprestados(self) -> List[Emprestimo]:
+        return [emp for emp in self.emprestimos.values() if emp.ativo]
+
+    def relatorio_usuarios(self) -> List[Usuario]:
+        return list(self.usuarios.values())
+
+    def painel_livros(self) -> List[Tuple[Livro, List[str]]]:
+        """
+        Cada livro com os nomes dos usuários que estão com ele emprestado.
+        """
+        nomes_por_livro: Dict[int, List[str]] = {}
+        for emp in self.emprestimos.values():
+            usuario = self.usuarios.get(emp.id_usuario)
+            if emp.ativo and usuario:
+                nomes_por_livro.setdefault(emp.id_livro, []).append(usuario.nome)
+        return [
+            (livro, nomes_por_livro.get(livro.id_livro, []))
+            for livro in self.livros.values()
+        ]
+
+    def painel_usuarios(self) -> List[Tuple[Usuario, int, List[str]]]:
+        """
+        Cada usuário com a quantidade de empréstimos ativos e os títulos emprestados.
+        """
+        ativos_por_usuario: Dict[int, List[Emprestimo]] = {}
+        for emp in self.emprestimos.values():
+            if emp.ativo:
+                ativos_por_usuario.setdefault(emp.id_usuario, []).append(emp)
+
+        painel = []
+        for usuario in self.usuarios.values():
+            ativos = ativos_por_usuario.get(usuario.id_usuario, [])
+            titulos = [
+                self.livros[emp.id_livro].titulo for emp in ativos if emp.id_livro in self.livros
+            ]
+            painel.append((usuario, len(ativos), titulos))
+        return painel
+
+
 class SistemaBiblioteca:
     """
     Classe principal que gerencia os cadastros, empréstimos, devoluções,
@@ -35,6 +128,32 @@ class SistemaBiblioteca:
         self.caminho_csv_livros = caminho_csv_livros
         self.caminho_csv_usuarios = caminho_csv_usuarios
 
+        # estado do CSV de livros na última leitura/gravação, usado para
+        # detectar edições externas: (mtime_ns, tamanho) e hash por linha
+        self._assinatura_csv_livros: Optional[Tuple[int, int]] = None
+        self._hashes_livros: Dict[int, int] = {}
+        # livros removidos do CSV que ainda tinham empréstimos ativos: não são
+        # mais gravados e saem do sistema quando a última cópia é devolvida
+        self._remocoes_pendentes: Set[int] = set()
+
+        # controle de snapshots (copy-on-write): toda alteração incrementa a
+        # versão; objetos possivelmente compartilhados com o último snapshot
+        # são copiados antes de serem alterados. Cada coleção também é
+        # mantida em páginas, e só as páginas alteradas desde o último
+        # snapshot são copiadas no próximo.
+        self._lock = threading.RLock()
+        self._versao = 0
+        self._ultimo_snapshot: Optional[SnapshotBiblioteca] = None
+        self._copiados: Set[Tuple[str, int]] = set()
+        self._paginas: Dict[str, Dict[int, dict]] = {c: {} for c in COLECOES}
+        self._paginas_sujas: Dict[str, Set[int]] = {c: set() for c in COLECOES}
+
+        # serializam leitura e gravação de cada CSV (e o estado de recarga
+        # acima). Só quem mexe nos arquivos os adquire, sempre antes de
+        # self._lock, para que a E/S não bloqueie leitores e empréstimos.
+        self._lock_csv_livros = threading.RLock()
+        self._lock_csv_usuarios = threading.Lock()
+
     # ================== LIVROS (CADASTRO + CSV) ==================
 
     def cadastrar_livro(
@@ -49,16 +168,18 @@ class SistemaBiblioteca:
         """
         Cadastra um novo livro em memória e, opcionalmente, salva no CSV.
         """
-        novo_id = next(self._gerador_ids_livro)
-        livro = Livro(
-            id_livro=novo_id,
-            titulo=titulo,
-            autor=autor,
-            categoria=categoria,
-            ano=ano,
-            total_copias=total_copias,
-        )
-        self.livros[novo_id] = livro
+        # Sob o lock: a recarga do CSV pode avançar o gerador ao mesmo tempo
+        with self._lock:
+            novo_id = next(self._gerador_ids_livro)
+            livro = Livro(
+                id_livro=novo_id,
+                titulo=titulo,
+                autor=autor,
+                categoria=categoria,
+                ano=ano,
+                total_copias=total_copias,
+            )
+            self._inserir("livros", novo_id, livro)
 
         if salvar:
             self.salvar_livros_csv()
@@ -76,43 +197,18 @@ class SistemaBiblioteca:
         se adaptar e assumir valores padrão.
         """
         try:
-            with open(self.caminho_csv_livros, mode="r", encoding="utf-8") as f:
+            assinatura = self._assinatura_arquivo(self.caminho_csv_livros)
+            with open(self.caminho_csv_livros, mode="r", encoding="utf-8-sig") as f:
                 leitor = csv.DictReader(f)
 
                 max_id = 0
                 for linha in leitor:
                     try:
-                        id_livro_str = linha.get("id_livro")
-                        if id_livro_str:
-                            id_livro = int(id_livro_str)
-                        else:
-                            id_livro = next(self._gerador_ids_livro)
-
-                        titulo = linha["titulo"].strip()
-                        autor = linha["autor"].strip()
-                        categoria = linha.get("categoria", "").strip()
-                        ano = int(linha["ano"])
-                        total_copias = int(linha["total_copias"])
-
-                        livro = Livro(
-                            id_livro=id_livro,
-                            titulo=titulo,
-                            autor=autor,
-                            categoria=categoria,
-                            ano=ano,
-                            total_copias=total_copias,
-                        )
-
-                        # Se o CSV já tiver copias_disponiveis, respeitamos.
-                        copias_disp_str = linha.get("copias_disponiveis")
-                        if copias_disp_str:
-                            try:
-                                livro.copias_disponiveis = int(copias_disp_str)
-                            except ValueError:
-                                # Mantém o padrão (todas disponíveis)
-                                pass
+                        livro = self._livro_de_linha(linha)
+                        id_livro = livro.id_livro
 
-                        self.livros[id_livro] = livro
+                        self._inserir("livros", id_livro, livro)
+                        self._hashes_livros[id_livro] = self._hash_livro(livro)
                         if id_livro > max_id:
                             max_id = id_livro
                     except KeyError as e:
@@ -124,10 +220,231 @@ class SistemaBiblioteca:
                 if max_id > 0:
                     self._gerador_ids_livro = itertools.count(max_id + 1)
 
+            self._assinatura_csv_livros = assinatura
+
         except FileNotFoundError:
             # Silencioso aqui; o main trata a mensagem amigável
             raise
 
+    def recarregar_livros_se_alterado(self) -> Tuple[int, int, int]:
+        """
+        Aplica no sistema as edições feitas externamente no CSV de livros
+        (ex.: em uma planilha), sem recarregar tudo.
+
+        A alteração do arquivo é detectada por mtime/tamanho; as linhas são
+        comparadas por hash com o estado carregado e apenas os livros
+        adicionados, alterados ou removidos são aplicados. As cópias
+        emprestadas são preservadas: copias_disponiveis é recalculado a
+        partir do novo total, e livros com empréstimos ativos não são removidos.
+
+        Retorna (adicionados, alterados, removidos).
+        """
+        try:
+            assinatura = self._assinatura_arquivo(self.caminho_csv_livros)
+        except FileNotFoundError:
+            return (0, 0, 0)
+        if assinatura == self._assinatura_csv_livros:
+            return (0, 0, 0)
+
+        with self._lock_csv_livros:
+            # Relê a assinatura: outra thread pode ter recarregado ou gravado
+            # o arquivo enquanto esta aguardava
+            try:
+                assinatura = self._assinatura_arquivo(self.caminho_csv_livros)
+            except FileNotFoundError:
+                return (0, 0, 0)
+            if assinatura == self._assinatura_csv_livros:
+                return (0, 0, 0)
+
+            # A leitura do arquivo acontece fora de self._lock
+            with open(self.caminho_csv_livros, mode="r", encoding="utf-8-sig") as f:
+                leitor = csv.DictReader(f)
+                faltando = [c for c in COLUNAS_RECARGA_LIVROS if c not in (leitor.fieldnames or [])]
+                if faltando:
+                    self._rejeitar_csv_livros(assinatura, faltando)
+                    return (0, 0, 0)
+                linhas = list(leitor)
+
+            with self._lock:
+                resultado, sem_id = self._aplicar_linhas_livros(linhas, assinatura)
+
+            # Linhas sem ID receberam um ID novo; regrava para não duplicá-las
+            # na próxima recarga
+            if sem_id:
+                self.salvar_livros_csv()
+
+            return resultado
+
+    def _aplicar_linhas_livros(
+        self, linhas: List[Dict[str, str]], assinatura: Tuple[int, int]
+    ) -> Tuple[Tuple[int, int, int], bool]:
+        """
+        Compara as linhas lidas do CSV com o estado carregado e aplica as
+        diferenças. Deve ser chamado com self._lock_csv_livros e self._lock
+        adquiridos. Retorna ((adicionados, alterados, removidos), sem_id).
+        """
+        adicionados = alterados = removidos = 0
+        sem_id = False
+        vistos = set()
+        # Linha inválida sem ID legível: não há como saber qual livro ela
+        # representa, então nenhum livro é removido nesta recarga
+        manter_todos = False
+        max_id = 0
+
+        for linha in linhas:
+            try:
+                novo = self._livro_de_linha(linha)
+            except (KeyError, ValueError):
+                # Um erro de digitação na planilha nunca remove o livro
+                print(f"[AVISO] Linha inválida no CSV de livros. Livro mantido sem alterações: {linha}")
+                id_livro_str = (linha.get("id_livro") or "").strip()
+                if id_livro_str:
+                    try:
+                        vistos.add(int(id_livro_str))
+                    except ValueError:
+                        manter_todos = True
+                continue
+            sem_id = sem_id or not linha.get("id_livro")
+
+            id_livro = novo.id_livro
+            vistos.add(id_livro)
+            max_id = max(max_id, id_livro)
+            if id_livro in self._remocoes_pendentes:
+                # Linha de volta na planilha: cancela a remoção pendente
+                self._remocoes_pendentes.discard(id_livro)
+            elif id_livro in self.livros and id_livro not in self._hashes_livros:
+                # Livro cadastrado em memória e ainda não salvo (ex.: modo lote)
+                print(
+                    f"[AVISO] ID {id_livro} do CSV de livros já pertence a um livro cadastrado "
+                    f"no sistema e ainda não salvo. Linha ignorada (cadastre-a sem ID): {linha}"
+                )
+                continue
+            hash_linha = self._hash_livro(novo)
+            if self._hashes_livros.get(id_livro) == hash_linha:
+                continue
+
+            if id_livro not in self.livros:
+                self._inserir("livros", id_livro, novo)
+                adicionados += 1
+            else:
+                atual = self._para_escrita("livros", id_livro)
+                emprestadas = atual.total_copias - atual.copias_disponiveis
+                atual.titulo = novo.titulo
+                atual.autor = novo.autor
+                atual.categoria = novo.categoria
+                atual.ano = novo.ano
+                if novo.total_copias < emprestadas:
+                    print(
+                        f"[AVISO] Livro ID {id_livro}: total de cópias {novo.total_copias} "
+                        f"menor que as {emprestadas} emprestadas. Total mantido em "
+                        f"{atual.total_copias}."
+                    )
+                    # O arquivo será regravado com o total mantido
+                    hash_linha = self._hash_livro(atual)
+                else:
+                    atual.total_copias = novo.total_copias
+                    atual.copias_disponiveis = novo.total_copias - emprestadas
+                alterados += 1
+            self._hashes_livros[id_livro] = hash_linha
+
+        # Só são removidos livros que constavam no arquivo anterior; livros
+        # cadastrados em memória e ainda não salvos permanecem.
+        ausentes = [i for i in self._hashes_livros if i not in vistos]
+        if manter_todos and ausentes:
+            print("[AVISO] Há linhas com ID inválido no CSV de livros. Nenhum livro foi removido.")
+            ausentes = []
+        for id_livro in ausentes:
+            if self._tem_emprestimo_ativo(id_livro):
+                print(
+                    f"[AVISO] Livro ID {id_livro} removido do CSV, mas possui "
+                    f"empréstimos ativos. Será removido após a devolução."
+                )
+                self._remocoes_pendentes.add(id_livro)
+                del self._hashes_livros[id_livro]
+                continue
+            self._remover("livros", id_livro)
+            del self._hashes_livros[id_livro]
+            removidos += 1
+
+        self._assinatura_csv_livros = assinatura
+        self._versao += 1
+
+        # Evita que IDs novos colidam com os adicionados na planilha
+        self._avancar_ids_livro(max_id)
+
+        return (adicionados, alterados, removidos), sem_id
+
+    def _avancar_ids_livro(self, max_id: int):
+        """
+        Garante que o próximo ID de livro seja maior que max_id sem descartar
+        nenhum: o valor lido do gerador é devolvido como início do novo.
+        Deve ser chamado com self._lock adquirido.
+        """
+        proximo_id = next(self._gerador_ids_livro)
+        self._gerador_ids_livro = itertools.count(max(proximo_id, max_id + 1))
+
+    def _rejeitar_csv_livros(self, assinatura: Tuple[int, int], faltando: List[str]):
+        """
+        Ignora um CSV de livros em formato inválido, guardando uma cópia dele
+        antes que a próxima gravação do sistema o substitua.
+        """
+        copia = f"{self.caminho_csv_livros}.rejeitado"
+        shutil.copy(self.caminho_csv_livros, copia)
+        print(
+            f"[AVISO] '{self.caminho_csv_livros}' não foi recarregado: colunas ausentes "
+            f"{', '.join(faltando)} (o separador deve ser vírgula). Nenhum livro foi "
+            f"alterado; o arquivo recebido foi preservado em '{copia}'."
+        )
+        self._assinatura_csv_livros = assinatura
+
+    def _livro_de_linha(self, linha: Dict[str, str]) -> Livro:
+        """
+        Converte uma linha do CSV de livros em Livro.
+        Levanta KeyError/ValueError para linhas inválidas.
+        """
+        titulo = linha["titulo"].strip()
+        autor = linha["autor"].strip()
+        categoria = (linha.get("categoria") or "").strip()
+        ano = int(linha["ano"])
+        total_copias = int(linha["total_copias"])
+
+        # O ID novo só é gerado depois da validação, para não desperdiçá-lo
+        id_livro_str = linha.get("id_livro")
+        if id_livro_str:
+            id_livro = int(id_livro_str)
+        else:
+            id_livro = next(self._gerador_ids_livro)
+
+        livro = Livro(
+            id_livro=id_livro,
+            titulo=titulo,
+            autor=autor,
+            categoria=categoria,
+            ano=ano,
+            total_copias=total_copias,
+        )
+
+        # Se o CSV já tiver copias_disponiveis, respeitamos.
+        copias_disp_str = linha.get("copias_disponiveis")
+        if copias_disp_str:
+            try:
+                livro.copias_disponiveis = int(copias_disp_str)
+            except ValueError:
+                # Mantém o padrão (todas disponíveis)
+                pass
+
+        return livro
+
+    @staticmethod
+    def _hash_livro(livro: Livro) -> int:
+        # copias_disponiveis fica de fora: é controlado pelo sistema
+        return hash((livro.titulo, livro.autor, livro.categoria, livro.ano, livro.total_copias))
+
+    @staticmethod
+    def _assinatura_arquivo(caminho: str) -> Tuple[int, int]:
+        info = os.stat(caminho)
+        return (info.st_mtime_ns, info.st_size)
+
     def salvar_livros_csv(self):
         """
         Salva o estado atual dos livros no CSV, incluindo copias_disponiveis.
@@ -141,21 +458,42 @@ class SistemaBiblioteca:
             "total_copias",
             "copias_disponiveis",
         ]
-        with open(self.caminho_csv_livros, mode="w", encoding="utf-8", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            for livro in self.livros.values():
-                writer.writerow(
-                    {
-                        "id_livro": livro.id_livro,
-                        "titulo": livro.titulo,
-                        "autor": livro.autor,
-                        "categoria": livro.categoria,
-                        "ano": livro.ano,
-                        "total_copias": livro.total_copias,
-                        "copias_disponiveis": livro.copias_disponiveis,
-                    }
-                )
+        with self._lock_csv_livros:
+            # Aplica antes eventuais edições externas no arquivo; do contrário
+            # elas seriam sobrescritas (e a nova assinatura esconderia a perda)
+            self.recarregar_livros_se_alterado()
+
+            # Só a captura do estado precisa de self._lock; a escrita do
+            # arquivo acontece fora dele, sem bloquear leitores e empréstimos
+            with self._lock:
+                snapshot = self.snapshot()
+                pendentes = set(self._remocoes_pendentes)
+
+            with open(self.caminho_csv_livros, mode="w", encoding="utf-8", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                writer.writeheader()
+                for livro in snapshot.livros.values():
+                    if livro.id_livro in pendentes:
+                        continue
+                    writer.writerow(
+                        {
+                            "id_livro": livro.id_livro,
+                            "titulo": livro.titulo,
+                            "autor": livro.autor,
+                            "categoria": livro.categoria,
+                            "ano": livro.ano,
+                            "total_copias": livro.total_copias,
+                            "copias_disponiveis": livro.copias_disponiveis,
+                        }
+                    )
+
+            # O arquivo gravado passa a ser a referência para recargas
+            self._hashes_livros = {
+                id_livro: self._hash_livro(livro)
+                for id_livro, livro in snapshot.livros.items()
+                if id_livro not in pendentes
+            }
+            self._assinatura_csv_livros = self._assinatura_arquivo(self.caminho_csv_livros)
 
     # ================== USUÁRIOS (CADASTRO + CSV) ==================
 
@@ -166,7 +504,7 @@ class SistemaBiblioteca:
             nome=nome,
             contato=contato,
         )
-        self.usuarios[novo_id] = usuario
+        self._inserir("usuarios", novo_id, usuario)
 
         if salvar:
             self.salvar_usuarios_csv()
@@ -181,7 +519,7 @@ class SistemaBiblioteca:
         id_usuario,nome,contato
         """
         try:
-            with open(self.caminho_csv_usuarios, mode="r", encoding="utf-8") as f:
+            with open(self.caminho_csv_usuarios, mode="r", encoding="utf-8-sig") as f:
                 leitor = csv.DictReader(f)
 
                 max_id = 0
@@ -201,7 +539,7 @@ class SistemaBiblioteca:
                             nome=nome,
                             contato=contato,
                         )
-                        self.usuarios[id_usuario] = usuario
+                        self._inserir("usuarios", id_usuario, usuario)
                         if id_usuario > max_id:
                             max_id = id_usuario
                     except KeyError as e:
@@ -220,63 +558,93 @@ class SistemaBiblioteca:
         Salva o estado atual dos usuários no CSV.
         """
         fieldnames = ["id_usuario", "nome", "contato"]
-        with open(self.caminho_csv_usuarios, mode="w", encoding="utf-8", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            for usuario in self.usuarios.values():
-                writer.writerow(
-                    {
-                        "id_usuario": usuario.id_usuario,
-                        "nome": usuario.nome,
-                        "contato": usuario.contato,
-                    }
-                )
+        with self._lock_csv_usuarios:
+            snapshot = self.snapshot()
+            with open(self.caminho_csv_usuarios, mode="w", encoding="utf-8", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                writer.writeheader()
+                for usuario in snapshot.usuarios.values():
+                    writer.writerow(
+                        {
+                            "id_usuario": usuario.id_usuario,
+                            "nome": usuario.nome,
+                            "contato": usuario.contato,
+                        }
+                    )
 
     # ================== EMPRÉSTIMO E DEVOLUÇÃO ==================
 
-    def emprestar_livro(self, id_usuario: int, id_livro: int) -> Emprestimo:
+    def emprestar_livro(self, id_usuario: int, id_livro: int, salvar: bool = True) -> Emprestimo:
         usuario = self.usuarios.get(id_usuario)
         if not usuario:
             raise UsuarioNaoEncontradoError(f"Usuário com ID {id_usuario} não encontrado.")
 
-        livro = self.livros.get(id_livro)
-        if not livro:
-            raise LivroNaoEncontradoError(f"Livro com ID {id_livro} não encontrado.")
-
-        livro.emprestar()
-
-        id_emprestimo = next(self._gerador_ids_emprestimo)
-        emprestimo = Emprestimo(
-            id_emprestimo=id_emprestimo,
-            id_usuario=id_usuario,
-            id_livro=id_livro,
-            ativo=True,
-        )
-        self.emprestimos[id_emprestimo] = emprestimo
+        with self._lock:
+            if id_livro not in self.livros:
+                raise LivroNaoEncontradoError(f"Livro com ID {id_livro} não encontrado.")
+            if id_livro in self._remocoes_pendentes:
+                raise LivroNaoEncontradoError(f"Livro com ID {id_livro} foi removido do catálogo.")
+
+            livro = self._para_escrita("livros", id_livro)
+            livro.emprestar()
+
+            id_emprestimo = next(self._gerador_ids_emprestimo)
+            emprestimo = Emprestimo(
+                id_emprestimo=id_emprestimo,
+                id_usuario=id_usuario,
+                id_livro=id_livro,
+                ativo=True,
+            )
+            self._inserir("emprestimos", id_emprestimo, emprestimo)
+            self._versao += 1
 
         # Atualiza CSV de livros com copias_disponiveis alteradas
-        self.salvar_livros_csv()
+        if salvar:
+            self.salvar_livros_csv()
 
         return emprestimo
 
-    def devolver_livro(self, id_emprestimo: int):
-        emprestimo = self.emprestimos.get(id_emprestimo)
+    def devolver_livro(self, id_emprestimo: int, salvar: bool = True):
+        with self._lock:
+            emprestimo = self.emprestimos.get(id_emprestimo)
+
+            if not emprestimo:
+                raise ValueError(f"Empréstimo com ID {id_emprestimo} não encontrado.")
 
-        if not emprestimo:
-            raise ValueError(f"Empréstimo com ID {id_emprestimo} não encontrado.")
+            if not emprestimo.ativo:
+                raise ValueError(f"Empréstimo {id_emprestimo} já foi encerrado.")
 
-        if not emprestimo.ativo:
-            raise ValueError(f"Empréstimo {id_emprestimo} já foi encerrado.")
+            if emprestimo.id_livro not in self.livros:
+                raise LivroNaoEncontradoError(f"Livro com ID {emprestimo.id_livro} não encontrado.")
 
-        livro = self.livros.get(emprestimo.id_livro)
-        if not livro:
-            raise LivroNaoEncontradoError(f"Livro com ID {emprestimo.id_livro} não encontrado.")
+            livro = self._para_escrita("livros", emprestimo.id_livro)
+            emprestimo = self._para_escrita("emprestimos", id_emprestimo)
+            livro.devolver()
+            emprestimo.ativo = False
 
-        livro.devolver()
-        emprestimo.ativo = False
+            # Último empréstimo de um livro já removido do CSV: sai do sistema
+            if (
+                livro.id_livro in self._remocoes_pendentes
+                and not self._tem_emprestimo_ativo(livro.id_livro)
+            ):
+                self._remover("livros", livro.id_livro)
+                self._remocoes_pendentes.discard(livro.id_livro)
+            self._versao += 1
 
         # Atualiza CSV de livros com copias_disponiveis alteradas
-        self.salvar_livros_csv()
+        if salvar:
+            self.salvar_livros_csv()
+
+    def _tem_emprestimo_ativo(self, id_livro: int) -> bool:
+        """
+        Indica se há empréstimos ativos registrados para o livro.
+
+        Cópias que o CSV marca como emprestadas em uma sessão anterior não
+        contam: esses empréstimos não são persistidos e nunca serão devolvidos.
+        """
+        return any(
+            emp.ativo and emp.id_livro == id_livro for emp in self.emprestimos.values()
+        )
 
     # ================== CONSULTA E RELATÓRIOS ==================
 
@@ -286,9 +654,11 @@ class SistemaBiblioteca:
         autor: Optional[str] = None,
         ano: Optional[int] = None,
         categoria: Optional[str] = None,
+        snapshot: Optional[SnapshotBiblioteca] = None,
     ) -> List[Livro]:
+        snapshot = snapshot or self.snapshot()
         resultados = []
-        for livro in self.livros.values():
+        for livro in snapshot.livros.values():
             if titulo and titulo.lower() not in livro.titulo.lower():
                 continue
             if autor and autor.lower() not in livro.autor.lower():
@@ -300,11 +670,113 @@ class SistemaBiblioteca:
             resultados.append(livro)
         return resultados
 
-    def relatorio_livros_disponiveis(self) -> List[Livro]:
-        return [livro for livro in self.livros.values() if livro.copias_disponiveis > 0]
+    # Relatórios e painéis aceitam o snapshot de uma tela que consulta mais
+    # de uma informação, para que tudo venha da mesma versão.
 
-    def relatorio_livros_emprestados(self) -> List[Emprestimo]:
-        return [emp for emp in self.emprestimos.values() if emp.ativo]
+    def relatorio_livros_disponiveis(
+        self, snapshot: Optional[SnapshotBiblioteca] = None
+    ) -> List[Livro]:
+        return (snapshot or self.snapshot()).relatorio_livros_disponiveis()
 
-    def relatorio_usuarios(self) -> List[Usuario]:
-        return list(self.usuarios.values())
+    def relatorio_livros_emprestados(
+        self, snapshot: Optional[SnapshotBiblioteca] = None
+    ) -> List[Emprestimo]:
+        return (snapshot or self.snapshot()).relatorio_livros_emprestados()
+
+    def relatorio_usuarios(self, snapshot: Optional[SnapshotBiblioteca] = None) -> List[Usuario]:
+        return (snapshot or self.snapshot()).relatorio_usuarios()
+
+    def painel_livros(
+        self, snapshot: Optional[SnapshotBiblioteca] = None
+    ) -> List[Tuple[Livro, List[str]]]:
+        return (snapshot or self.snapshot()).painel_livros()
+
+    def painel_usuarios(
+        self, snapshot: Optional[SnapshotBiblioteca] = None
+    ) -> List[Tuple[Usuario, int, List[str]]]:
+        return (snapshot or self.snapshot()).painel_usuarios()
+
+    # ================== SNAPSHOTS (LEITURA CONSISTENTE) ==================
+
+    def snapshot(self) -> SnapshotBiblioteca:
+        """
+        Retorna uma visão somente leitura do estado atual.
+
+        Enquanto não houver alterações, o mesmo snapshot é reaproveitado.
+        Um novo snapshot reaproveita as páginas e coleções que não mudaram
+        desde o anterior e copia apenas as páginas alteradas, então o custo
+        (e o tempo com o lock dos escritores) cresce com as alterações, não
+        com o tamanho do acervo. Os objetos só são copiados quando alterados
+        depois (copy-on-write).
+        """
+        with self._lock:
+            anterior = self._ultimo_snapshot
+            if anterior is not None and anterior.versao == self._versao:
+                return anterior
+
+            visoes = {}
+            for colecao in COLECOES:
+                sujas = self._paginas_sujas[colecao]
+                if anterior is not None and not sujas:
+                    visoes[colecao] = getattr(anterior, colecao)
+                    continue
+
+                paginas = dict(getattr(anterior, colecao)._paginas) if anterior else {}
+                for numero in sujas:
+                    viva = self._paginas[colecao].get(numero)
+                    if viva:
+                        paginas[numero] = dict(viva)
+                    else:
+                        paginas.pop(numero, None)
+                visoes[colecao] = _VisaoPaginada(paginas, len(getattr(self, colecao)))
+                sujas.clear()
+
+            self._ultimo_snapshot = SnapshotBiblioteca(versao=self._versao, **visoes)
+            # A partir daqui todos os objetos estão compartilhados
+            self._copiados.clear()
+            return self._ultimo_snapshot
+
+    def _inserir(self, colecao: str, chave: int, objeto):
+        """
+        Insere um objeto novo (ainda não compartilhado) em livros,
+        usuarios ou emprestimos.
+        """
+        with self._lock:
+            self._definir(colecao, chave, objeto)
+            self._copiados.add((colecao, chave))
+            self._versao += 1
+
+    def _remover(self, colecao: str, chave: int):
+        """
+        Remove um objeto de livros, usuarios ou emprestimos.
+        """
+        with self._lock:
+            getattr(self, colecao).pop(chave, None)
+            numero = chave // TAMANHO_PAGINA
+            pagina = self._paginas[colecao].get(numero)
+            if pagina is not None:
+                pagina.pop(chave, None)
+                if not pagina:
+                    del self._paginas[colecao][numero]
+            self._paginas_sujas[colecao].add(numero)
+            self._versao += 1
+
+    def _para_escrita(self, colecao: str, chave: int):
+        """
+        Retorna o objeto pronto para ser alterado, substituindo-o por uma
+        cópia se ele puder estar em um snapshot já entregue.
+        Deve ser chamado com self._lock adquirido.
+        """
+        objeto = getattr(self, colecao)[chave]
+        if self._ultimo_snapshot is not None and (colecao, chave) not in self._copiados:
+            objeto = copy.copy(objeto)
+            self._definir(colecao, chave, objeto)
+            self._copiados.add((colecao, chave))
+        return objeto
+
+    def _definir(self, colecao: str, chave: int, objeto):
+        # Mantém o dicionário e a página correspondente em sincronia
+        numero = chave // TAMANHO_PAGINA
+        getattr(self, colecao)[chave] = objeto
+        self._paginas[colecao].setdefault(numero, {})[chave] = objeto
+        self._paginas_sujas[colecao].add(numero)
@@ -0,0 +1,145 @@
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from services import SistemaBiblioteca
+from models import LivroNaoEncontradoError
+
+
+CABECALHO = "id_livro,titulo,autor,categoria,ano,total_copias,copias_disponiveis"
+LINHAS = [
+    "1,Dom Casmurro,Machado de Assis,Clássico Brasileiro,1899,5,5",
+    "2,O Cortiço,Aluísio Azevedo,Clássico Brasileiro,1890,3,3",
+    "3,Capitães da Areia,Jorge Amado,Clássico Brasileiro,1937,4,3",
+]
+USUARIOS = "id_usuario,nome,contato\n1,Ana Souza,ana@example.com\n2,Carlos Oliveira,carlos@example.com\n"
+
+
+class TestRecargaLivros(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.mkdtemp()
+        self.caminho = os.path.join(self.pasta, "livros.csv")
+        caminho_usuarios = os.path.join(self.pasta, "usuarios.csv")
+        self.escrever(LINHAS)
+        with open(caminho_usuarios, mode="w", encoding="utf-8") as f:
+            f.write(USUARIOS)
+
+        self.sistema = SistemaBiblioteca(self.caminho, caminho_usuarios)
+        self.sistema.carregar_livros_de_csv()
+        self.sistema.carregar_usuarios_de_csv()
+        self.saida = StringIO()
+
+    def tearDown(self):
+        shutil.rmtree(self.pasta)
+
+    def escrever(self, linhas, cabecalho=CABECALHO, encoding="utf-8", separador=","):
+        conteudo = "\n".join([cabecalho] + linhas) + "\n"
+        with open(self.caminho, mode="w", encoding=encoding) as f:
+            f.write(conteudo.replace(",", separador))
+        # Garante mtime diferente mesmo em sistemas de arquivos com baixa resolução
+        info = os.stat(self.caminho)
+        os.utime(self.caminho, ns=(info.st_atime_ns, info.st_mtime_ns + 10**9))
+
+    def recarregar(self):
+        with redirect_stdout(self.saida):
+            return self.sistema.recarregar_livros_se_alterado()
+
+    def ids_no_csv(self):
+        with open(self.caminho, mode="r", encoding="utf-8-sig") as f:
+            return [int(linha["id_livro"]) for linha in csv.DictReader(f)]
+
+    def test_sem_alteracao_nao_recarrega(self):
+        self.assertEqual(self.recarregar(), (0, 0, 0))
+
+    def test_aplica_apenas_diferencas(self):
+        self.escrever(
+            [LINHAS[0].replace("Dom Casmurro", "Dom Casmurro (rev.)"), LINHAS[1]]
+            + ["7,Vidas Secas,Graciliano Ramos,Clássico Brasileiro,1938,2,2"]
+        )
+        self.assertEqual(self.recarregar(), (1, 1, 1))
+        self.assertEqual(self.sistema.livros[1].titulo, "Dom Casmurro (rev.)")
+        self.assertNotIn(3, self.sistema.livros)
+        self.assertIn(7, self.sistema.livros)
+        self.assertEqual(self.sistema.cadastrar_livro("x", "y", 1, 1, "c", salvar=False).id_livro, 8)
+
+    def test_cabecalho_com_bom(self):
+        self.escrever([LINHAS[0].replace("Dom Casmurro", "DC")] + LINHAS[1:], encoding="utf-8-sig")
+        self.assertEqual(self.recarregar(), (0, 1, 0))
+        self.assertEqual(sorted(self.sistema.livros), [1, 2, 3])
+        self.assertEqual(self.sistema.livros[1].titulo, "DC")
+
+    def test_separador_ponto_e_virgula_nao_altera_nada(self):
+        self.escrever(LINHAS[:1], separador=";")
+        self.assertEqual(self.recarregar(), (0, 0, 0))
+        self.assertEqual(sorted(self.sistema.livros), [1, 2, 3])
+        self.assertTrue(os.path.exists(self.caminho + ".rejeitado"))
+
+        with redirect_stdout(self.saida):
+            self.sistema.salvar_livros_csv()
+        self.assertEqual(self.ids_no_csv(), [1, 2, 3])
+
+    def test_linha_invalida_mantem_livro(self):
+        self.escrever([LINHAS[0], LINHAS[1].replace("1890", "18x0"), LINHAS[2]])
+        self.assertEqual(self.recarregar(), (0, 0, 0))
+        self.assertEqual(self.sistema.livros[2].ano, 1890)
+
+        with redirect_stdout(self.saida):
+            self.sistema.salvar_livros_csv()
+        self.assertIn(2, self.ids_no_csv())
+
+    def test_linha_com_id_invalido_nao_remove_nenhum_livro(self):
+        self.escrever([LINHAS[0], LINHAS[1].replace("2,", "2x,", 1)])
+        self.recarregar()
+        self.assertEqual(sorted(self.sistema.livros), [1, 2, 3])
+
+    def test_remocao_de_livro_emprestado_fica_pendente(self):
+        emprestimo = self.sistema.emprestar_livro(1, 2)
+        self.escrever([LINHAS[0], LINHAS[2]])
+        self.assertEqual(self.recarregar(), (0, 0, 0))
+        self.assertIn(2, self.sistema.livros)
+        with self.assertRaises(LivroNaoEncontradoError):
+            self.sistema.emprestar_livro(2, 2, salvar=False)
+
+        # Gravações não devolvem a linha ao CSV
+        with redirect_stdout(self.saida):
+            self.sistema.salvar_livros_csv()
+        self.assertNotIn(2, self.ids_no_csv())
+
+        self.sistema.devolver_livro(emprestimo.id_emprestimo)
+        self.assertNotIn(2, self.sistema.livros)
+        self.assertNotIn(2, self.ids_no_csv())
+
+    def test_remocao_sem_emprestimo_ativo_e_imediata(self):
+        # O CSV marca uma cópia do livro 3 como emprestada, mas não há empréstimo registrado
+        self.escrever(LINHAS[:2])
+        self.assertEqual(self.recarregar(), (0, 0, 1))
+        self.assertNotIn(3, self.sistema.livros)
+
+    def test_total_menor_que_emprestadas_e_recusado(self):
+        for id_usuario in (1, 2, 1):
+            self.sistema.emprestar_livro(id_usuario, 2, salvar=False)
+        self.escrever([LINHAS[0], LINHAS[1].replace(",1890,3,", ",1890,1,"), LINHAS[2]])
+        self.recarregar()
+        livro = self.sistema.livros[2]
+        self.assertEqual((livro.total_copias, livro.copias_disponiveis), (3, 0))
+
+    def test_gravacao_preserva_edicao_externa(self):
+        self.escrever(LINHAS + ["9,Iracema,José de Alencar,Romance,1865,1,1"])
+        with redirect_stdout(self.saida):
+            self.sistema.emprestar_livro(1, 1)
+        self.assertIn(9, self.sistema.livros)
+        self.assertIn(9, self.ids_no_csv())
+
+    def test_id_de_livro_nao_salvo_nao_e_sobrescrito(self):
+        livro = self.sistema.cadastrar_livro("Do lote", "Autor", 2000, 1, "c", salvar=False)
+        self.escrever(LINHAS + [f"{livro.id_livro},Da planilha,Outro,c,2001,1,1"])
+        self.recarregar()
+        self.assertEqual(self.sistema.livros[livro.id_livro].titulo, "Do lote")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import os
+import random
+import shutil
+import tempfile
+import threading
+import unittest
+
+from services import SistemaBiblioteca, TAMANHO_PAGINA
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.mkdtemp()
+        self.sistema = SistemaBiblioteca(
+            os.path.join(self.pasta, "livros.csv"),
+            os.path.join(self.pasta, "usuarios.csv"),
+        )
+        for i in range(5):
+            self.sistema.cadastrar_livro(f"Livro {i}", "Autor", 2000, 3, "Romance", salvar=False)
+        for i in range(3):
+            self.sistema.cadastrar_usuario(f"Usuário {i}", "contato", salvar=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.pasta)
+
+    def test_reaproveitado_sem_alteracoes(self):
+        snapshot = self.sistema.snapshot()
+        self.sistema.buscar_livros(titulo="Livro")
+        self.assertIs(self.sistema.snapshot(), snapshot)
+
+    def test_nao_ve_emprestimo_e_devolucao_posteriores(self):
+        antes = self.sistema.snapshot()
+        emprestimo = self.sistema.emprestar_livro(1, 1, salvar=False)
+        depois_emprestimo = self.sistema.snapshot()
+        self.sistema.devolver_livro(emprestimo.id_emprestimo, salvar=False)
+        depois_devolucao = self.sistema.snapshot()
+
+        self.assertEqual(antes.livros[1].copias_disponiveis, 3)
+        self.assertNotIn(emprestimo.id_emprestimo, antes.emprestimos)
+        self.assertEqual(depois_emprestimo.livros[1].copias_disponiveis, 2)
+        self.assertTrue(depois_emprestimo.emprestimos[emprestimo.id_emprestimo].ativo)
+        self.assertEqual(depois_devolucao.livros[1].copias_disponiveis, 3)
+        self.assertFalse(depois_devolucao.emprestimos[emprestimo.id_emprestimo].ativo)
+        self.assertGreater(depois_devolucao.versao, depois_emprestimo.versao)
+
+    def test_somente_leitura(self):
+        snapshot = self.sistema.snapshot()
+        with self.assertRaises(TypeError):
+            snapshot.livros[1] = None
+
+    def test_colecoes_e_paginas_inalteradas_sao_compartilhadas(self):
+        for _ in range(TAMANHO_PAGINA):
+            self.sistema.cadastrar_usuario("Outro", "contato", salvar=False)
+        antes = self.sistema.snapshot()
+        self.sistema.emprestar_livro(1, 1, salvar=False)
+        depois = self.sistema.snapshot()
+
+        self.assertIs(depois.usuarios, antes.usuarios)
+        self.assertEqual(len(depois.usuarios), len(self.sistema.usuarios))
+        self.assertEqual(list(depois.livros), list(self.sistema.livros))
+
+    def test_remocao_de_livro(self):
+        antes = self.sistema.snapshot()
+        with self.sistema._lock:
+            self.sistema._remover("livros", 2)
+        depois = self.sistema.snapshot()
+        self.assertIn(2, antes.livros)
+        self.assertNotIn(2, depois.livros)
+        self.assertEqual(len(depois.livros), 4)
+
+    def test_painel_e_relatorios_usam_o_snapshot_informado(self):
+        snapshot = self.sistema.snapshot()
+        self.sistema.emprestar_livro(1, 1, salvar=False)
+        self.assertEqual(self.sistema.relatorio_livros_emprestados(snapshot), [])
+        self.assertEqual(len(self.sistema.relatorio_livros_emprestados()), 1)
+        painel = dict((livro.id_livro, nomes) for livro, nomes in self.sistema.painel_livros())
+        self.assertEqual(painel[1], ["Usuário 0"])
+
+    def test_consistente_com_emprestimos_concorrentes(self):
+        inconsistencias = []
+
+        def escritor():
+            for _ in range(2000):
+                emprestimo = self.sistema.emprestar_livro(
+                    random.randint(1, 3), random.randint(1, 5), salvar=False
+                )
+                self.sistema.devolver_livro(emprestimo.id_emprestimo, salvar=False)
+
+        def verificar(snapshot):
+            ativos = {}
+            for emp in snapshot.emprestimos.values():
+                if emp.ativo:
+                    ativos[emp.id_livro] = ativos.get(emp.id_livro, 0) + 1
+            for id_livro, livro in snapshot.livros.items():
+                if livro.total_copias - livro.copias_disponiveis != ativos.get(id_livro, 0):
+                    inconsistencias.append(snapshot.versao)
+
+        retido = self.sistema.snapshot()
+        copias_retido = {i: livro.copias_disponiveis for i, livro in retido.livros.items()}
+        # Empréstimo que continua ativo até o fim: o snapshot retido não pode vê-lo
+        self.sistema.emprestar_livro(2, 1, salvar=False)
+
+        escritores = [threading.Thread(target=escritor) for _ in range(2)]
+        for t in escritores:
+            t.start()
+        while any(t.is_alive() for t in escritores):
+            verificar(self.sistema.snapshot())
+            verificar(retido)
+        for t in escritores:
+            t.join()
+
+        # O snapshot retido antes dos escritores não viu nenhuma alteração
+        verificar(retido)
+        self.assertEqual(
+            {i: livro.copias_disponiveis for i, livro in retido.livros.items()}, copias_retido
+        )
+        self.assertEqual(len(retido.emprestimos), 0)
+        self.assertEqual(inconsistencias, [])
+        self.assertEqual(len(self.sistema.relatorio_livros_emprestados()), 1)
+
+if __name__ == "__main__":
+    unittest.main()
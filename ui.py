@@ -97,7 +97,10 @@ def consultar_livros_ui(sistema: SistemaBiblioteca):
     """
     print("\n--- Consulta de Livros (Todos por Disponibilidade e Categoria) ---")
 
-    if not sistema.livros:
+    # Busca sem filtros = todos os livros, lidos de um snapshot consistente
+    livros = sistema.buscar_livros()
+
+    if not livros:
         print("Nenhum livro cadastrado no sistema.")
         return
 
@@ -107,7 +110,7 @@ def consultar_livros_ui(sistema: SistemaBiblioteca):
     indisponiveis_por_cat = defaultdict(list)
 
     # Separa os livros em disponíveis e indisponíveis, agrupando por categoria
-    for livro in sistema.livros.values():
+    for livro in livros:
         categoria = livro.categoria if livro.categoria else "Sem categoria"
         if livro.copias_disponiveis > 0:
             disponiveis_por_cat[categoria].append(livro)
@@ -170,8 +173,12 @@ def relatorios_ui(sistema: SistemaBiblioteca):
         exibir_menu_relatorios()
         opcao = input("Escolha uma opção: ").strip()
 
+        if opcao in ("1", "2", "3"):
+            # Um único snapshot por relatório: tudo vem da mesma versão
+            snapshot = sistema.snapshot()
+
         if opcao == "1":
-            livros = sistema.relatorio_livros_disponiveis()
+            livros = sistema.relatorio_livros_disponiveis(snapshot)
             if not livros:
                 print("\nNenhum livro disponível no momento.")
             else:
@@ -187,14 +194,14 @@ def relatorios_ui(sistema: SistemaBiblioteca):
                     )
 
         elif opcao == "2":
-            emprestimos = sistema.relatorio_livros_emprestados()
+            emprestimos = sistema.relatorio_livros_emprestados(snapshot)
             if not emprestimos:
                 print("\nNão há livros emprestados no momento.")
             else:
                 print("\n--- Livros Emprestados ---")
                 for emp in emprestimos:
-                    livro = sistema.livros.get(emp.id_livro)
-                    usuario = sistema.usuarios.get(emp.id_usuario)
+                    livro = snapshot.livros.get(emp.id_livro)
+                    usuario = snapshot.usuarios.get(emp.id_usuario)
                     print(
                         f"ID Empréstimo: {emp.id_emprestimo} | "
                         f"Livro: {livro.titulo if livro else 'N/A'} (ID {emp.id_livro}) | "
@@ -202,7 +209,7 @@ def relatorios_ui(sistema: SistemaBiblioteca):
                     )
 
         elif opcao == "3":
-            usuarios = sistema.relatorio_usuarios()
+            usuarios = sistema.relatorio_usuarios(snapshot)
             if not usuarios:
                 print("\nNenhum usuário cadastrado.")
             else:
@@ -221,23 +228,13 @@ def relatorios_ui(sistema: SistemaBiblioteca):
 
 def painel_livros_ui(sistema: SistemaBiblioteca):
     print("\n====== PAINEL DE GERENCIAMENTO DE LIVROS ======")
+    painel = sistema.painel_livros()
 
-    if not sistema.livros:
+    if not painel:
         print("Nenhum livro cadastrado no sistema.")
         return
 
-    for livro in sistema.livros.values():
-        emprestimos_ativos = [
-            emp for emp in sistema.emprestimos.values()
-            if emp.ativo and emp.id_livro == livro.id_livro
-        ]
-
-        usuarios_com_livro = []
-        for emp in emprestimos_ativos:
-            usuario = sistema.usuarios.get(emp.id_usuario)
-            if usuario:
-                usuarios_com_livro.append(usuario.nome)
-
+    for livro, usuarios_com_livro in painel:
         if livro.copias_disponiveis == livro.total_copias:
             status = "Totalmente disponível"
         elif livro.copias_disponiveis == 0:
@@ -270,28 +267,18 @@ def painel_usuarios_ui(sistema: SistemaBiblioteca):
     - Lista os títulos emprestados para cada usuário
     """
     print("\n====== PAINEL DE GERENCIAMENTO DE USUÁRIOS ======")
+    painel = sistema.painel_usuarios()
 
-    if not sistema.usuarios:
+    if not painel:
         print("Nenhum usuário cadastrado.")
         return
 
-    for usuario in sistema.usuarios.values():
-        emprestimos_ativos = [
-            emp for emp in sistema.emprestimos.values()
-            if emp.ativo and emp.id_usuario == usuario.id_usuario
-        ]
-
-        livros_usuario = []
-        for emp in emprestimos_ativos:
-            livro = sistema.livros.get(emp.id_livro)
-            if livro:
-                livros_usuario.append(livro.titulo)
-
+    for usuario, qtd_emprestimos, livros_usuario in painel:
         print("\n-------------------------------------")
         print(f"ID Usuário: {usuario.id_usuario}")
         print(f"Nome: {usuario.nome}")
         print(f"Contato: {usuario.contato}")
-        print(f"Quantidade de livros emprestados: {len(emprestimos_ativos)}")
+        print(f"Quantidade de livros emprestados: {qtd_emprestimos}")
 
         if livros_usuario:
             print("Livros emprestados:")
@@ -301,8 +288,21 @@ def painel_usuarios_ui(sistema: SistemaBiblioteca):
             print("Nenhum livro emprestado no momento.")
 
 
+def verificar_alteracoes_csv(sistema: SistemaBiblioteca):
+    """
+    Aplica edições externas no CSV de livros (ex.: feitas em planilha).
+    """
+    adicionados, alterados, removidos = sistema.recarregar_livros_se_alterado()
+    if adicionados or alterados or removidos:
+        print(
+            f"\n[INFO] 'livros.csv' foi alterado externamente: "
+            f"{adicionados} adicionado(s), {alterados} alterado(s), {removidos} removido(s)."
+        )
+
+
 def executar_interface(sistema: SistemaBiblioteca):
     while True:
+        verificar_alteracoes_csv(sistema)
         exibir_menu()
         opcao = input("Escolha uma opção: ").strip()
 